@@ -1,8 +1,21 @@
 import streamlit as st
-from bs4 import BeautifulSoup
-import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from html import escape, unescape
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+import orjson
+from xxhash import xxh3_64_intdigest
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # C-backed parser (fast path)
+except ImportError:
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup, SoupStrainer
 
 # =====================================================
 # Config
@@ -14,12 +27,15 @@ st.caption("Upload a template-based HTML slide, edit fields, translate headings
 # =====================================================
 # Constants & helpers
 # =====================================================
-FIELD_KEYS = [
+FIELD_KEYS = (
     "title", "left_label", "right_label",
     "left_people", "left_process", "left_technology", "left_data", "left_output",
     "right_people", "right_process", "right_technology", "right_data", "right_output",
     "page_number", "footer_summary",
-]
+)
+
+# Reads every field in one call; session_state is fully initialised before the preview/save paths run
+_pick_fields = itemgetter(*FIELD_KEYS)
 
 STATE_FILE = Path("streamlit_irrbb_state.json")
 
@@ -68,6 +84,14 @@ STATIC_LABELS = {
     },
 }
 
+LABEL_KEYS = ("people", "process", "technology", "data", "output")
+
+# Slot tokens in a compiled slide: \ue000<name>\ue001. Private-use delimiters survive lexbor and both BS4
+# builders verbatim (lexbor drops NUL), and filling them is a plain regex pass, so nothing in an upload
+# is ever evaluated as template code.
+_SLOT_OPEN, _SLOT_CLOSE = "\ue000", "\ue001"
+_SLOT_RE = re.compile(_SLOT_OPEN + r"(\w+)" + _SLOT_CLOSE)
+
 # =====================================================
 # Translation (best effort)
 # =====================================================
@@ -80,41 +104,216 @@ def _get_translator_or_none():
         return None
 
 
-def translate_text(txt: str, src: str, dest: str) -> str:
-    if not txt:
-        return txt
-    GT = _get_translator_or_none()
-    if GT is None or src == dest:
-        return txt
+def _translation_memo() -> Dict[Tuple[str, str, str], str]:
+    """This session's (src, dest, text) -> translation memo; failures are never stored.
+
+    Kept in session_state rather than a process-wide cache, so entered text is never shared
+    across users and is gone with the session.
+    """
+    return st.session_state.setdefault("_translation_memo", {})
+
+
+def _translate_one(GT, txt: str, src: str, dest: str) -> Optional[str]:
     try:
         return GT(source=src, target=dest).translate(txt)
     except Exception:
-        # Fail safe: just return original
-        return txt
+        return None
+
+
+def translate_many(texts: List[str], src: str, dest: str, GT=None) -> List[str]:
+    """Translate the distinct, not yet memoized strings concurrently, one request each."""
+    if src == dest:
+        return list(texts)
+    memo = _translation_memo()
+    todo = list(dict.fromkeys(t for t in texts if t and (src, dest, t) not in memo))
+    if todo and GT is None:
+        GT = _get_translator_or_none()
+    if todo and GT is not None:
+        # deep-translator's translate_batch is just a sequential loop of requests;
+        # the calls are network-bound, so fan them out instead
+        with ThreadPoolExecutor(max_workers=min(8, len(todo))) as ex:
+            results = list(ex.map(lambda t: _translate_one(GT, t, src, dest), todo))
+        memo.update(((src, dest, t), r) for t, r in zip(todo, results) if r)
+    return [memo.get((src, dest, t), t) for t in texts]
 
 
 # =====================================================
 # HTML parsing & synthesis
 # =====================================================
 
-def parse_html_fields(html: str) -> Dict[str, str]:
-    """Parse fields from a slide HTML based on the known template structure."""
-    soup = BeautifulSoup(html, "html.parser")
+# Tags read by parse_html_fields; the BS4 fallback skips everything else (head, scripts, styles).
+_FIELD_TAGS = ["h1", "div", "footer", "span", "strong", "p", "h3"]
+
+
+# Thin backend shims: lexbor when available, BeautifulSoup otherwise.
+def _parse(html: str, fields_only: bool = False):
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(html)
+    if fields_only:
+        return BeautifulSoup(html, "lxml", parse_only=SoupStrainer(_FIELD_TAGS))
+    return BeautifulSoup(html, "lxml")
+
+
+def _css(tag: Optional[str], cls: Optional[str]) -> str:
+    """Lexbor selector for a tag and a space-separated class list, e.g. ("div", "panel left") -> "div.panel.left"."""
+    return (tag or "") + "".join(f".{c}" for c in (cls or "").split())
+
+
+def _find(node, tag: Optional[str] = None, cls: Optional[str] = None):
+    """First descendant of ``node`` with the given tag and class attribute (None-safe)."""
+    if node is None:
+        return None
+    if LexborHTMLParser is not None:
+        return node.css_first(_css(tag, cls))
+    # class_=None would mean "has no class attribute" to bs4, not "any class"
+    return node.find(tag, class_=cls) if cls is not None else node.find(tag)
+
+
+def _find_all(node, tag: Optional[str] = None, cls: Optional[str] = None) -> list:
+    if node is None:
+        return []
+    if LexborHTMLParser is not None:
+        return node.css(_css(tag, cls))
+    return node.find_all(tag, class_=cls) if cls is not None else node.find_all(tag)
+
+
+def _get_text(el) -> str:
+    if el is None:
+        return ""
+    return el.text(strip=True) if LexborHTMLParser is not None else el.get_text(strip=True)
+
+
+def _set_text(el, value: str) -> None:
+    if el is None:
+        return
+    if LexborHTMLParser is not None:
+        el.inner_html = escape(value, quote=False)
+    else:
+        el.string = value
+
+
+def _serialize(doc) -> str:
+    # Only runs once per base slide (template build). BS4 must keep its default "minimal" formatter:
+    # formatter=None would write the uploaded document's own text unescaped into the template.
+    return doc.html if LexborHTMLParser is not None else str(doc)
+
+
+def _panel(doc, side: str):
+    """First div carrying both the "panel" and the ``side`` class, in any order and among other classes."""
+    if LexborHTMLParser is not None:
+        return doc.css_first(_css("div", f"panel {side}"))
+    # find(class_="panel left") would only match that exact attribute string
+    for el in doc.find_all("div", class_="panel"):
+        if side in el["class"]:
+            return el
+    return None
+
+
+def _section_items(panel, tag: str) -> list:
+    """Every <tag> inside the panel's .section divs, in document order (".panel.x .section tag")."""
+    if panel is None:
+        return []
+    if LexborHTMLParser is not None:
+        return panel.css(f".section {tag}")
+    # Nested .section divs would yield the same element twice; keep each once, like select(".section p").
+    # Keyed by id(): bs4 tags compare (and hash) by markup, so two identical <p>s would collapse into one.
+    items = {id(el): el for section in panel.find_all(class_="section") for el in section.find_all(tag)}
+    return list(items.values())
 
-    def get_text(selector: str) -> str:
-        el = soup.select_one(selector)
-        return el.get_text(strip=True) if el else ""
 
-    left_sections = soup.select(".panel.left .section p")
-    right_sections = soup.select(".panel.right .section p")
+def _panel_slots(doc, side: str):
+    """Locate a panel once and return (side-label tag, section <p>s, section <h3>s)."""
+    panel = _panel(doc, side)
+    tag = _find(_find(panel, "div", "side-label"), "span", "tag")
+    return tag, _section_items(panel, "p"), _section_items(panel, "h3")
+
+
+def _template_regex() -> "re.Pattern[str]":
+    """Verbatim template shape (as exported by this app); slot values must be plain text."""
+    val = r"[^<\r]*"
+
+    def panel(side: str) -> str:
+        return (
+            rf'<div class="panel {side}"><div class="side-label"><span class="tag">(?P<{side}_label>{val})</span></div>\s*'
+            + "".join(rf'<div class="section"><h3>[^<]*</h3><p>(?P<{side}_{n}>{val})</p></div>\s*' for n in LABEL_KEYS)
+            + r"</div>\s*"
+        )
+
+    return re.compile(
+        rf"<h1>(?P<title>{val})</h1>\s*" + panel("left") + panel("right")
+        + rf'<footer><span class="pagenum">(?P<page_number>{val})</span>\s*<strong>(?P<footer_summary>{val})</strong></footer>'
+    )
+
+
+_TEMPLATE_RE = _template_regex()
+
+
+def _slots_by_css(doc):
+    """Slot nodes via selector queries (lexbor: each query runs in C)."""
+    slots: Dict[str, object] = {"title": _find(doc, "h1")}
+    sections: Dict[str, list] = {}
+    for side in ("left", "right"):
+        panel = _panel(doc, side)
+        slots[f"{side}_label"] = _find(_find(panel, "div", "side-label"), "span", "tag")
+        sections[side] = _section_items(panel, "p")
+    footer = _find(doc, "footer")
+    slots["page_number"] = _find(footer, cls="pagenum")
+    slots["footer_summary"] = _find(footer, "strong")
+    return slots, sections
+
+
+def _slots_by_walk(doc):
+    """Slot nodes from one DFS over a BS4 tree; context flags stand in for the descendant selectors."""
+    slots: Dict[str, object] = {}
+    sections: Dict[str, list] = {"left": [], "right": []}  # every .section <p>, per panel, in document order
+
+    def walk(node, side: Optional[str], in_label: bool, section: bool, in_footer: bool) -> None:
+        for el in node.children:
+            tag = el.name
+            if tag is None:
+                continue
+            classes = el.get("class") or []
+            s, lab, sec, foot = side, in_label, section, in_footer
+            if tag == "h1":
+                slots.setdefault("title", el)
+            elif tag == "footer":
+                foot = slots.setdefault("footer", el) is el
+            elif tag == "div" and "panel" in classes:
+                own = "left" if "left" in classes else "right" if "right" in classes else None
+                # A side-less .panel stays inside the enclosing side; only the first panel per side counts
+                if own is not None:
+                    s = own if slots.setdefault(f"{own}_panel", el) is el else None
+            elif side and tag == "div" and "side-label" in classes:
+                lab = True
+            elif side and tag == "div" and "section" in classes:
+                sec = True
+            elif in_label and tag == "span" and "tag" in classes:
+                slots.setdefault(f"{side}_label", el)
+            elif section and side is not None and tag == "p":
+                sections[side].append(el)
+            elif in_footer and tag == "strong":
+                slots.setdefault("footer_summary", el)
+            if in_footer and "pagenum" in classes:
+                slots.setdefault("page_number", el)
+            walk(el, s, lab, sec, foot)
+
+    walk(doc, None, False, False, False)
+    return slots, sections
+
+
+def _fields_from_tree(html: str) -> Dict[str, str]:
+    doc = _parse(html, fields_only=True)
+    # Selector queries are C-level on lexbor; on BS4 each find is a Python tree walk, so walk once instead
+    slots, sections = _slots_by_css(doc) if LexborHTMLParser is not None else _slots_by_walk(doc)
 
     def sec(idx: int, arr):
-        return arr[idx].get_text(strip=True) if len(arr) > idx else ""
+        return _get_text(arr[idx]) if len(arr) > idx else ""
 
+    left_sections, right_sections = sections["left"], sections["right"]
     fields: Dict[str, str] = {
-        "title": get_text("h1"),
-        "left_label": get_text(".panel.left .side-label .tag"),
-        "right_label": get_text(".panel.right .side-label .tag"),
+        "title": _get_text(slots.get("title")),
+        "left_label": _get_text(slots.get("left_label")),
+        "right_label": _get_text(slots.get("right_label")),
         "left_people": sec(0, left_sections),
         "left_process": sec(1, left_sections),
         "left_technology": sec(2, left_sections),
@@ -125,9 +324,21 @@ def parse_html_fields(html: str) -> Dict[str, str]:
         "right_technology": sec(2, right_sections),
         "right_data": sec(3, right_sections),
         "right_output": sec(4, right_sections),
-        "page_number": get_text("footer .pagenum"),
-        "footer_summary": get_text("footer strong"),
+        "page_number": _get_text(slots.get("page_number")),
+        "footer_summary": _get_text(slots.get("footer_summary")),
     }
+    return fields
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def parse_html_fields(html: str) -> Dict[str, str]:
+    """Parse fields from a slide HTML based on the known template structure."""
+    m = _TEMPLATE_RE.search(html)
+    if m is not None and html.count("<h1") == 1 and html.count("<footer") == 1:
+        # Fast path: the slide is the template verbatim, no tree needed
+        fields = {k: unescape(m[k]).strip() for k in FIELD_KEYS}
+    else:
+        fields = _fields_from_tree(html)
 
     for k in FIELD_KEYS:
         if not fields.get(k):
@@ -135,65 +346,74 @@ def parse_html_fields(html: str) -> Dict[str, str]:
     return fields
 
 
+def _inner_html(el) -> str:
+    """Serialized children of an element (same formatter as _serialize)."""
+    return el.inner_html if LexborHTMLParser is not None else el.decode_contents()
+
+
+def _slot(name: str) -> str:
+    return _SLOT_OPEN + name + _SLOT_CLOSE
+
+
+def _template_source(base_html: str) -> Tuple[str, Dict[str, str]]:
+    """Turn a slide into (source, defaults): field slots, headings and lang become slot tokens.
+
+    ``defaults`` holds the uploaded HTML for the slots that keep it unless a label language is requested.
+    """
+    doc = _parse(base_html)
+    defaults: Dict[str, str] = {}
+
+    root = _find(doc, "html")
+    if root is not None:
+        defaults["lang"] = escape(root.attrs.get("lang") or "")
+        root.attrs["lang"] = _slot("lang")
+
+    _set_text(_find(doc, "h1"), _slot("title"))
+    for side in ("left", "right"):
+        tag, ps, h3s = _panel_slots(doc, side)
+        _set_text(tag, _slot(f"{side}_label"))
+        # n-th .section <p>/<h3> of the panel, as parse_html_fields counts them
+        for p, name in zip(ps, LABEL_KEYS):
+            _set_text(p, _slot(f"{side}_{name}"))
+        for h3, name in zip(h3s, LABEL_KEYS):
+            defaults[f"{side}_{name}_heading"] = _inner_html(h3)
+            _set_text(h3, _slot(f"{side}_{name}_heading"))
+
+    footer = _find(doc, "footer")
+    _set_text(_find(footer, cls="pagenum"), _slot("page_number"))
+    _set_text(_find(footer, "strong"), _slot("footer_summary"))
+
+    return _serialize(doc), defaults
+
+
+def _fill_slots(source: str, defaults: Dict[str, str], fields: Dict[str, str], label_lang: Optional[str]) -> str:
+    """Render a compiled slide in one regex pass; values are HTML-escaped and never re-scanned."""
+    values = dict(defaults)
+    values.update((k, escape(fields[k])) for k in FIELD_KEYS)
+    if label_lang in ("sl", "en"):
+        values["lang"] = label_lang
+    labels = STATIC_LABELS.get(label_lang)
+    if labels:
+        values.update((f"{side}_{name}_heading", escape(labels[name])) for side in ("left", "right") for name in LABEL_KEYS)
+    return _SLOT_RE.sub(lambda m: values.get(m.group(1), m.group(0)), source)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _slide_template(base_html: str) -> Callable[[Dict[str, str], Optional[str]], str]:
+    """Compile base_html once per process; returns a ``render(fields, label_lang)`` callable."""
+    return partial(_fill_slots, *_template_source(base_html))
+
+
 def apply_fields_to_html(original_html: str, fields: Dict[str, str], label_lang: Optional[str] = None) -> str:
-    """Apply field values and static label language to the uploaded HTML."""
-    soup = BeautifulSoup(original_html, "html.parser")
-
-    # Optionally set the document language attribute
-    if label_lang in ("sl", "en") and soup.html is not None:
-        soup.html["lang"] = label_lang
-
-    def set_text(selector: str, value: str) -> None:
-        el = soup.select_one(selector)
-        if el is not None:
-            el.string = value
-
-    # Title & side labels
-    set_text("h1", fields["title"])  # title
-    set_text(".panel.left .side-label .tag", fields["left_label"])  # left label
-    set_text(".panel.right .side-label .tag", fields["right_label"])  # right label
-
-    # Sections (content)
-    def set_sec(panel_sel: str, idx: int, value: str) -> None:
-        ps = soup.select(f"{panel_sel} .section p")
-        if len(ps) > idx and ps[idx] is not None:
-            ps[idx].string = value
-
-    set_sec(".panel.left", 0, fields["left_people"])
-    set_sec(".panel.left", 1, fields["left_process"])
-    set_sec(".panel.left", 2, fields["left_technology"])
-    set_sec(".panel.left", 3, fields["left_data"])
-    set_sec(".panel.left", 4, fields["left_output"])
-
-    set_sec(".panel.right", 0, fields["right_people"])
-    set_sec(".panel.right", 1, fields["right_process"])
-    set_sec(".panel.right", 2, fields["right_technology"])
-    set_sec(".panel.right", 3, fields["right_data"])
-    set_sec(".panel.right", 4, fields["right_output"])
-
-    # Static section headings (translate field NAMES on the slide)
-    if label_lang in STATIC_LABELS:
-        labels = STATIC_LABELS[label_lang]
-        left_h3s = soup.select(".panel.left .section h3")
-        right_h3s = soup.select(".panel.right .section h3")
-        desired = [
-            labels["people"],
-            labels["process"],
-            labels["technology"],
-            labels["data"],
-            labels["output"],
-        ]
-        for idx, text in enumerate(desired):
-            if len(left_h3s) > idx and left_h3s[idx]:
-                left_h3s[idx].string = text
-            if len(right_h3s) > idx and right_h3s[idx]:
-                right_h3s[idx].string = text
-
-    # Footer
-    set_text("footer .pagenum", fields["page_number"])  # page number
-    set_text("footer strong", fields["footer_summary"])  # summary
-
-    return str(soup)
+    """Apply field values and static label language to the uploaded HTML.
+
+    One-shot entry point; the preview calls the renderer kept in session state directly.
+    """
+    return _slide_template(original_html)(fields, label_lang)
+
+
+# Precompile the fallback slide so the first preview doesn't pay for it
+_slide_template(FALLBACK_HTML)
 
 
 # =====================================================
@@ -203,7 +423,7 @@ def apply_fields_to_html(original_html: str, fields: Dict[str, str], label_lang:
 def load_persisted() -> Optional[Dict[str, str]]:
     try:
         if STATE_FILE.exists():
-            return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+            return orjson.loads(STATE_FILE.read_bytes())
     except Exception:
         pass
     return None
@@ -211,9 +431,10 @@ def load_persisted() -> Optional[Dict[str, str]]:
 
 def persist(fields: Dict[str, str]) -> None:
     try:
-        STATE_FILE.write_text(
-            json.dumps(fields, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+        # Write aside and swap in, so a crash mid-write never leaves a truncated state file
+        tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+        tmp.write_bytes(orjson.dumps(fields, option=orjson.OPT_INDENT_2))
+        os.replace(tmp, STATE_FILE)
     except Exception:
         pass
 
@@ -224,9 +445,9 @@ def persist(fields: Dict[str, str]) -> None:
 
 def init_fields(fields: Dict[str, str]) -> None:
     """Force-initialize widget state from given fields (overwrites existing)."""
-    for k in FIELD_KEYS:
-        st.session_state[k] = fields.get(k, DEFAULTS.get(k, ""))
-    st.session_state["fields_obj"] = {k: st.session_state[k] for k in FIELD_KEYS}
+    bulk = {k: fields.get(k, DEFAULTS.get(k, "")) for k in FIELD_KEYS}
+    st.session_state.update(bulk)
+    st.session_state["fields_obj"] = bulk
 
 
 def clear_widget_state() -> None:
@@ -245,10 +466,11 @@ with st.sidebar:
     )
     if uploaded is not None:
         file_bytes = uploaded.getvalue()
-        new_hash = hash(file_bytes)
+        new_hash = xxh3_64_intdigest(file_bytes)  # stable across processes, unlike hash()
         if st.session_state.get("_upload_hash") != new_hash:
             html = file_bytes.decode("utf-8", errors="ignore")
             st.session_state["base_html"] = html
+            st.session_state["base_template"] = _slide_template(html)
             parsed = parse_html_fields(html)
             clear_widget_state()
             init_fields(parsed)
@@ -259,7 +481,7 @@ with st.sidebar:
     col_s, col_l = st.columns(2)
     with col_s:
         if st.button("💾 Save fields", use_container_width=True):
-            persist({k: st.session_state.get(k, DEFAULTS.get(k, "")) for k in FIELD_KEYS})
+            persist(dict(zip(FIELD_KEYS, _pick_fields(st.session_state))))
             st.toast("Saved locally (streamlit_irrbb_state.json)")
     with col_l:
         if st.button("📥 Load fields", use_container_width=True):
@@ -275,7 +497,17 @@ with st.sidebar:
     lang = st.radio("Translate to", ["sl", "en"], horizontal=True, key="_lang")
     if st.button("🌐 Translate current fields", use_container_width=True):
         src = "sl" if lang == "en" else "en"
-        translated = {k: translate_text(st.session_state.get(k, ""), src, lang) for k in FIELD_KEYS}
+        translated = {k: st.session_state.get(k, "") for k in FIELD_KEYS}
+        # Skip fields that still hold what we produced for this language last time
+        last = st.session_state.setdefault("_last_translated", {})
+        todo = [k for k in FIELD_KEYS if translated[k] and last.get(k) != (lang, translated[k])]
+        if todo:
+            GT = _get_translator_or_none()  # resolved once per click, not per field
+            originals = [translated[k] for k in todo]
+            translated.update(zip(todo, translate_many(originals, src, lang, GT)))
+            # A failed field comes back unchanged and unmemoized; leave it out so the next click retries it
+            memo = _translation_memo()
+            last.update((k, (lang, translated[k])) for k, t in zip(todo, originals) if (src, lang, t) in memo)
         init_fields(translated)
         # Remember chosen label language for static headings & set HTML lang
         st.session_state["_label_lang"] = lang
@@ -286,6 +518,7 @@ with st.sidebar:
         clear_widget_state()
         init_fields({k: "" for k in FIELD_KEYS})
         st.session_state["base_html"] = FALLBACK_HTML
+        st.session_state["base_template"] = _slide_template(FALLBACK_HTML)
         st.session_state["_upload_hash"] = None
         st.toast("Cleared fields and reset base HTML")
 
@@ -294,6 +527,8 @@ with st.sidebar:
 # Base HTML for preview/export & first-time init
 # =====================================================
 base_html = st.session_state.get("base_html", FALLBACK_HTML)
+if "base_template" not in st.session_state:
+    st.session_state["base_template"] = _slide_template(base_html)
 if not any(k in st.session_state for k in FIELD_KEYS):
     init_fields(DEFAULTS.copy())
 
@@ -336,9 +571,17 @@ with st.form("editor_form", clear_on_submit=False):
 # =====================================================
 # Live preview & export
 # =====================================================
-current = {k: st.session_state.get(k, DEFAULTS.get(k, "")) for k in FIELD_KEYS}
+current = dict(zip(FIELD_KEYS, _pick_fields(st.session_state)))
 label_lang = st.session_state.get("_label_lang", "sl")
-preview_html = apply_fields_to_html(base_html, current, label_lang=label_lang)
+# Re-render only when the base slide, a field value or the label language changed;
+# the renderer object itself is part of the key, so a new upload always misses
+preview_key = (st.session_state["base_template"], tuple(current.values()), label_lang)
+if st.session_state.get("_preview_key") != preview_key:
+    preview_html = preview_key[0](current, label_lang)
+    # Encode once; the download button reuses these bytes on every rerun
+    st.session_state["_preview"] = (preview_html, preview_html.encode("utf-8"))
+    st.session_state["_preview_key"] = preview_key
+preview_html, preview_bytes = st.session_state["_preview"]
 
 st.subheader("Preview")
 st.components.v1.html(preview_html, height=900, scrolling=True)
@@ -347,7 +590,7 @@ st.download_button(
     label="⬇️ Download updated HTML",
     file_name="edited_slide.html",
     mime="text/html",
-    data=preview_html.encode("utf-8"),
+    data=preview_bytes,
     use_container_width=True,
 )
 
@@ -359,7 +602,7 @@ with colA:
     saved_json = st.file_uploader("Import fields JSON", type=["json"], key="import_json")
     if saved_json is not None:
         try:
-            data = json.load(saved_json)
+            data = orjson.loads(saved_json.getvalue())
             clear_widget_state()
             init_fields({k: data.get(k, DEFAULTS.get(k, "")) for k in FIELD_KEYS})
             st.success("Imported fields from JSON.")
@@ -370,6 +613,6 @@ with colB:
         label="Export current fields (JSON)",
         file_name="fields_export.json",
         mime="application/json",
-        data=json.dumps(current, ensure_ascii=False, indent=2).encode("utf-8"),
+        data=orjson.dumps(current, option=orjson.OPT_INDENT_2),
         use_container_width=True,
     )
\ No newline at end of file
@@ -1,7 +1,22 @@
 # as_is_to_be_8.py
+from __future__ import annotations  # bs4 types below are annotation-only until a soup is actually built
+
+import copy
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from html import escape
 import streamlit as st
-from bs4 import BeautifulSoup
-from typing import Dict, Optional, List, Union
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Mapping, Optional, List, Tuple, TypeVar, Union
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # C-backed parser for read-only extraction
+except ImportError:
+    LexborHTMLParser = None
 
 # =====================================================
 # Config
@@ -59,7 +74,9 @@ FIELD_KEYS = [
     "right_people", "right_process", "right_technology", "right_data", "right_output",
     "user_notes",
 ]
-DEFAULTS: Dict[str, str] = {k: "TBD" for k in FIELD_KEYS}
+# The five standard sections of each side panel, in document order (also the STATIC_LABELS keys)
+SECTION_KEYS = ("people", "process", "technology", "data", "output")
+DEFAULTS: Dict[str, str] = dict.fromkeys(FIELD_KEYS, "TBD")  # every field key is present, so DEFAULTS[k] is safe
 DEFAULTS.update({
     "left_label": "AS-IS (danes)",
     "right_label": "Ambicija (to-be)",
@@ -120,91 +137,307 @@ def _get_translator_or_none():
     except Exception:
         return None
 
-def translate_text(txt: str, src: str, dest: str) -> str:
-    if not txt:
-        return txt
-    GT = _get_translator_or_none()
-    if GT is None or src == dest:
-        return txt
+def _translation_memo() -> Dict[Tuple[str, str, str], str]:
+    """Per-session (src, dest, text) -> translation memo; failures are never stored.
+
+    Lives in session_state, as the privacy notice promises: inputs stay within the session.
+    """
+    return st.session_state.setdefault("_translation_memo", {})
+
+# Joins several fields into one request; U+241E (SYMBOL FOR RECORD SEPARATOR) survives translation untouched
+_BATCH_SEP = "\n␞\n"
+# Splits a batch reply; takes only the one newline _BATCH_SEP put on each side, the rest belongs to the fields
+_BATCH_SPLIT_RE = re.compile(r"\n?␞\n?")
+
+def _translate_one(GT, txt: str, src: str, dest: str) -> Optional[str]:
+    """One translator round-trip; no Streamlit calls, so it is safe on a worker thread."""
     try:
-        return GT(source=src, target=dest).translate(txt)
+        return GT(source=src, target=dest).translate(txt) or None
     except Exception:
-        return txt
+        return None
+
+def translate_many(texts: List[str], src: str, dest: str) -> List[str]:
+    """Translate several strings with a single request for the distinct, not yet memoized ones."""
+    GT = _get_translator_or_none()
+    if GT is None or src == dest:
+        return list(texts)
+    memo = _translation_memo()
+    todo = list(dict.fromkeys(t for t in texts if t and (src, dest, t) not in memo))
+    if len(todo) > 1:
+        try:
+            joined = GT(source=src, target=dest).translate(_BATCH_SEP.join(todo))
+            parts = _BATCH_SPLIT_RE.split(joined) if joined else []
+        except Exception:
+            parts = []
+        # Only trust the batch if every separator came back; otherwise fall back to one request per field
+        if len(parts) == len(todo):
+            memo.update(((src, dest, t), p) for t, p in zip(todo, parts) if p.strip())
+            todo = [t for t in todo if (src, dest, t) not in memo]
+    if todo:
+        # Per-field calls are network-bound, so run them concurrently (~1 round-trip instead of one per field)
+        with ThreadPoolExecutor(max_workers=len(todo)) as ex:
+            results = list(ex.map(lambda t: _translate_one(GT, t, src, dest), todo))
+        memo.update(((src, dest, t), r) for t, r in zip(todo, results) if r)
+    return [memo.get((src, dest, t), t) for t in texts]
 
 # ---------------- HTML parsing helpers ----------------
+_T = TypeVar("_T")
+
+def _session_memo(fn: Callable[..., _T]) -> Callable[..., _T]:
+    """Remember fn's latest result in this session's session_state instead of a process-wide st.cache_*.
+
+    Uploaded slides carry user content, so their parsed trees and templates stay within the session, as the
+    privacy notice promises. A session edits one slide at a time, so one entry per function is enough.
+    """
+    name = f"_memo_{fn.__name__}"
+
+    @wraps(fn)
+    def wrapper(*args):
+        hit = st.session_state.get(name)
+        if hit is None or hit[0] != args:
+            hit = (args, fn(*args))
+            st.session_state[name] = hit
+        return hit[1]
+    return wrapper
+
+def _make_soup(html: str) -> BeautifulSoup:
+    """Parse with the C-backed lxml builder; fall back to the pure-Python parser if lxml is missing."""
+    # Deferred import: with selectolax installed only Apply needs bs4, so runs that never apply skip loading it.
+    # After the first call this is just a sys.modules lookup, which is already process-wide.
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+# Streamlit reruns the script on every interaction; keep the session's parsed tree across reruns.
+# The cached soup is reused — read it directly, but copy it before mutating (see apply_fields_to_soup).
+@_session_memo
+def _cached_soup(html: str) -> BeautifulSoup:
+    return _make_soup(html)
+
+_CR_RE = re.compile(r"\r\n?")
+
+def _normalize_newlines(txt: str) -> str:
+    """Map CRLF and lone CR to LF in one pass; lxml/lexbor text is usually clean already, so mostly just a scan."""
+    return _CR_RE.sub("\n", txt) if "\r" in txt else txt
+
 def _text_with_newlines(el) -> str:
     """Extract text preserving line breaks and special symbols."""
     if not el:
         return ""
-    txt = el.get_text(separator="\n", strip=False)
-    return txt.replace("\r\n", "\n").replace("\r", "\n")
+    return _normalize_newlines(el.get_text(separator="\n", strip=False))
+
+def _panels(soup: BeautifulSoup) -> Dict[str, Tag]:
+    """Map "left"/"right"/"user" to the first .panel carrying that class, in one tree walk."""
+    panels: Dict[str, Tag] = {}
+    for el in soup.find_all(class_="panel"):
+        classes = el.get("class", ())
+        for side in ("left", "right", "user"):
+            if side in classes and side not in panels:
+                panels[side] = el
+    return panels
+
+def _sections(panel: Optional[Tag]) -> List[Tag]:
+    """The outermost .section blocks of a panel (empty if the panel is missing).
+
+    A .section nested in another one travels with its parent: it is neither counted as an extra
+    block nor walked a second time, so each <p>/<h3> below is collected exactly once.
+    """
+    if panel is None:
+        return []
+    return [sec for sec in panel.find_all(class_="section") if sec.find_parent(class_="section") is None]
+
+def _section_tags(panel: Optional[Tag], name: str) -> List[Tag]:
+    """All <name> elements inside a panel's sections, in document order (like ".panel.x .section name")."""
+    return [el for sec in _sections(panel) for el in sec.find_all(name)]
+
+def _index_tags(sections: List[Tag], names: Tuple[str, ...]) -> Dict[str, List[Tag]]:
+    """Bucket the <names> elements of the given sections by tag name, in document order, with one walk per section."""
+    out: Dict[str, List[Tag]] = {n: [] for n in names}
+    for sec in sections:
+        for el in sec.find_all(list(names)):
+            out[el.name].append(el)
+    return out
 
-def _headings_from_panel(soup: BeautifulSoup, panel_sel: str) -> List[str]:
+# Case-insensitive search runs in C; no lowered copy of every id/class string
+_FOOTER_RE = re.compile("footer", re.IGNORECASE)
+
+def _is_footer(el: Tag) -> bool:
+    """<footer>, role="contentinfo", or an id/class containing 'footer' (case-insensitive)."""
+    if el.name == "footer" or el.get("role") == "contentinfo":
+        return True
+    el_id = el.get("id")
+    if isinstance(el_id, str) and _FOOTER_RE.search(el_id):
+        return True
+    classes = el.get("class")
+    if not classes:
+        return False
+    # "footer" has no space in it, so searching the joined class list can't match across two classes
+    return _FOOTER_RE.search(classes if isinstance(classes, str) else " ".join(classes)) is not None
+
+def _side_tag(panel: Optional[Tag]) -> Optional[Tag]:
+    """The .side-label .tag element of a panel, if any."""
+    label = panel.find(class_="side-label") if panel is not None else None
+    return label.find(class_="tag") if label is not None else None
+
+def _headings_from_panel(panel: Optional[Tag]) -> List[str]:
     """Return up to first five h3 headings of a panel, preserving punctuation."""
-    h3s = soup.select(f"{panel_sel} .section h3")
+    h3s = _section_tags(panel, "h3")
     out: List[str] = []
     for h in h3s[:5]:
         t = h.get_text(separator=" ", strip=True)
         out.append(t)
     return out
 
-def detect_ui_labels_from_html(html: str) -> Dict[str, Union[List[str], str, None]]:
-    """Auto-detect section headings for left/right panels and user notes label; return doc language if available."""
-    soup = BeautifulSoup(html, "html.parser")
-    left = _headings_from_panel(soup, ".panel.left")
-    right = _headings_from_panel(soup, ".panel.right")
-    user_h = soup.select_one(".panel.user .section h3")
-    user_label = user_h.get_text(separator=" ", strip=True) if user_h else "User notes"
-    lang = (soup.html.get("lang") if soup and soup.html else None)
+# ---------------- selectolax (read-only extraction fast path) ----------------
+# Text inside these never counts as content (bs4's get_text skips it too)
+_NON_TEXT_TAGS = ("script", "style", "template")
+
+def _lex_strings(node) -> Iterator[str]:
+    """The text nodes under a selectolax node, in document order."""
+    for t in node.traverse(include_text=True):
+        if t.tag == "-text" and t.parent.tag not in _NON_TEXT_TAGS:
+            yield t.text_content
+
+def _lex_text(node) -> str:
+    """selectolax twin of _text_with_newlines."""
+    if node is None:
+        return ""
+    return _normalize_newlines("\n".join(_lex_strings(node)))
+
+def _lex_heading(node) -> str:
+    """selectolax twin of get_text(separator=" ", strip=True)."""
+    return " ".join(s for s in (t.strip() for t in _lex_strings(node)) if s)
+
+def _lex_panels(tree) -> Dict[str, object]:
+    return {side: tree.css_first(f".panel.{side}") for side in ("left", "right", "user")}
+
+def _lex_all(panel, selector: str) -> list:
+    return panel.css(selector) if panel is not None else []
+
+def _lex_first(panel, selector: str):
+    return panel.css_first(selector) if panel is not None else None
+
+# ---------------- Field / label extraction ----------------
+def _labels_dict(left: List[str], right: List[str], user_label: Optional[str], lang: Optional[str]) -> Dict[str, Union[List[str], str, None]]:
     if lang not in ("sl", "en"):
         lang = None
     return {
         "left": left,
         "right": right,
-        "user": user_label,
+        "user": user_label or "User notes",
         "doc_lang": lang,
     }
 
-def parse_html_fields(html: str) -> Dict[str, str]:
-    soup = BeautifulSoup(html, "html.parser")
-
-    def get_text(selector: str) -> str:
-        el = soup.select_one(selector)
-        return _text_with_newlines(el) if el else ""
-
-    left_sections = soup.select(".panel.left .section p")
-    right_sections = soup.select(".panel.right .section p")
-    user_section = soup.select_one(".panel.user .section p")
-
-    def sec(idx: int, arr):
-        if len(arr) > idx and arr[idx]:
-            return _text_with_newlines(arr[idx])
-        return ""
-
-    fields: Dict[str, str] = {
-        "title": get_text("h1"),
-        "left_label": get_text(".panel.left .side-label .tag"),
-        "right_label": get_text(".panel.right .side-label .tag"),
-        "left_people": sec(0, left_sections),
-        "left_process": sec(1, left_sections),
-        "left_technology": sec(2, left_sections),
-        "left_data": sec(3, left_sections),
-        "left_output": sec(4, left_sections),
-        "right_people": sec(0, right_sections),
-        "right_process": sec(1, right_sections),
-        "right_technology": sec(2, right_sections),
-        "right_data": sec(3, right_sections),
-        "right_output": sec(4, right_sections),
-        "user_notes": _text_with_newlines(user_section) if user_section else "",
-    }
+def _fields_dict(title: str, left_label: str, right_label: str, left_texts: List[str], right_texts: List[str], user_notes: str) -> Dict[str, str]:
+    """Assemble the field dict from extracted texts; empty fields fall back to DEFAULTS."""
+    fields: Dict[str, str] = {"title": title, "left_label": left_label, "right_label": right_label}
+    for side, texts in (("left", left_texts), ("right", right_texts)):
+        for idx, key in enumerate(SECTION_KEYS):
+            fields[f"{side}_{key}"] = texts[idx] if len(texts) > idx else ""
+    fields["user_notes"] = user_notes
     for k in FIELD_KEYS:
         if not fields.get(k):
-            fields[k] = DEFAULTS.get(k, "TBD")
+            fields[k] = DEFAULTS[k]
     return fields
 
-def apply_fields_to_html(original_html: str, fields: Dict[str, str], label_lang: Optional[str] = None) -> str:
-    soup = BeautifulSoup(original_html, "html.parser")
+def _lex_labels(tree) -> Dict[str, Union[List[str], str, None]]:
+    panels = _lex_panels(tree)
+    user_h = _lex_first(panels["user"], ".section h3")
+    root = tree.css_first("html")
+    return _labels_dict(
+        [_lex_heading(h) for h in _lex_all(panels["left"], ".section h3")[:5]],
+        [_lex_heading(h) for h in _lex_all(panels["right"], ".section h3")[:5]],
+        _lex_heading(user_h) if user_h is not None else None,
+        root.attributes.get("lang") if root is not None else None,
+    )
+
+def detect_ui_labels_soup(soup: BeautifulSoup) -> Dict[str, Union[List[str], str, None]]:
+    """Same as detect_ui_labels_from_html, on an already-built soup (not modified)."""
+    panels = _panels(soup)
+    user_h3s = _section_tags(panels.get("user"), "h3")
+    return _labels_dict(
+        _headings_from_panel(panels.get("left")),
+        _headings_from_panel(panels.get("right")),
+        user_h3s[0].get_text(separator=" ", strip=True) if user_h3s else None,
+        soup.html.get("lang") if soup.html is not None else None,
+    )
+
+def _lex_fields(tree) -> Dict[str, str]:
+    panels = _lex_panels(tree)
+    user_p = _lex_first(panels["user"], ".section p")
+    return _fields_dict(
+        _lex_text(tree.css_first("h1")),
+        _lex_text(_lex_first(panels["left"], ".side-label .tag")),
+        _lex_text(_lex_first(panels["right"], ".side-label .tag")),
+        [_lex_text(p) for p in _lex_all(panels["left"], ".section p")[:5]],
+        [_lex_text(p) for p in _lex_all(panels["right"], ".section p")[:5]],
+        _lex_text(user_p),
+    )
+
+# An upload reads both the fields and the labels; parse it once and answer both from the same tree
+@_session_memo
+def _lex_extract(html: str) -> Tuple[Dict[str, str], Dict[str, Union[List[str], str, None]]]:
+    tree = LexborHTMLParser(html)
+    return _lex_fields(tree), _lex_labels(tree)
+
+def detect_ui_labels_from_html(html: str) -> Dict[str, Union[List[str], str, None]]:
+    """Auto-detect section headings for left/right panels and user notes label; return doc language if available."""
+    if LexborHTMLParser is None:
+        return detect_ui_labels_soup(_cached_soup(html))
+    return _lex_extract(html)[1]
+
+def parse_html_fields(html: str) -> Dict[str, str]:
+    if LexborHTMLParser is None:
+        return parse_html_fields_soup(_cached_soup(html))
+    return _lex_extract(html)[0]
+
+def parse_html_fields_soup(soup: BeautifulSoup) -> Dict[str, str]:
+    """Read the editable fields from an already-built soup (not modified)."""
+    panels = _panels(soup)
+    left, right = panels.get("left"), panels.get("right")
+    user_ps = _section_tags(panels.get("user"), "p")
+    return _fields_dict(
+        _text_with_newlines(soup.find("h1")),
+        _text_with_newlines(_side_tag(left)),
+        _text_with_newlines(_side_tag(right)),
+        [_text_with_newlines(p) for p in _section_tags(left, "p")[:5]],
+        [_text_with_newlines(p) for p in _section_tags(right, "p")[:5]],
+        _text_with_newlines(user_ps[0] if user_ps else None),
+    )
+
+def _strip_footers(soup: BeautifulSoup) -> None:
+    """Remove footers so the last visible block is user_notes; depends only on the document, not on the fields."""
+    # 1) One walk over all elements; reverse document order visits children before their ancestors,
+    #    so nothing still ahead in the list has been decomposed along with an earlier match
+    for el in reversed(soup.find_all(True)):
+        if _is_footer(el):
+            el.decompose()
+
+    # 2) Ensure user panel is positioned as the last visible content block
+    user_panel = _panels(soup).get("user")
+    if user_panel is not None and user_panel.parent:
+        parent = user_panel.parent
+        user_panel.extract()
+        parent.append(user_panel)
 
+# Footer removal is done once per document here instead of in every Apply/template build.
+# Reused like _cached_soup — copy before mutating.
+@_session_memo
+def _clean_soup(html: str) -> BeautifulSoup:
+    # Copy the tree extraction already parsed instead of parsing the document a second time
+    soup = copy.copy(_cached_soup(html))
+    _strip_footers(soup)
+    return soup
+
+def apply_fields_to_soup(base_soup: BeautifulSoup, fields: Mapping[str, str], label_lang: Optional[str] = None) -> str:
+    """Render fields into a copy of a footer-cleaned base soup (see _clean_soup), leaving it untouched for the next Apply."""
+    return _apply_fields(copy.copy(base_soup), fields, label_lang)
+
+def _apply_fields(soup: BeautifulSoup, fields: Mapping[str, str], label_lang: Optional[str]) -> str:
+    """Write fields into soup in place and return the serialized document."""
     # Force <html lang="..."> to requested lang if provided
     if label_lang in ("sl", "en") and soup.html is not None:
         soup.html["lang"] = label_lang
@@ -213,125 +446,99 @@ def apply_fields_to_html(original_html: str, fields: Dict[str, str], label_lang:
     def set_rich_text(el, value: str) -> None:
         if el is None:
             return
-        value = (value or "").replace("\r\n", "\n").replace("\r", "\n")
-        el.clear()
+        value = _normalize_newlines(value or "")
+        if "\n" not in value:
+            # Single line (every template slot and static label): one clear + text node
+            el.string = value
+            return
+        # Multi-line values: clear, then append the text/<br/> run (Tag.extend still appends item by item).
+        # (Assigning el.contents directly would skip bs4's next_element links that serialization relies on.)
         parts = value.split("\n")
-        for i, part in enumerate(parts):
-            el.append(part)  # text node; special symbols preserved/escaped safely
-            if i < len(parts) - 1:
-                el.append(soup.new_tag("br"))
-
-    # Trim extra sections beyond the standard five per panel (ignore additional fields)
-    for panel_sel in (".panel.left", ".panel.right"):
-        sections = soup.select(f"{panel_sel} .section")
-        if len(sections) > 5:
-            for extra in sections[5:]:
-                extra.decompose()
+        children = [parts[0]]  # text nodes; special symbols preserved/escaped safely
+        for part in parts[1:]:
+            children.append(soup.new_tag("br"))
+            children.append(part)
+        el.clear()
+        el.extend(children)
+
+    # Look the panels up once; every edit below works inside these nodes
+    panels = _panels(soup)
+    left, right, user_panel = panels.get("left"), panels.get("right"), panels.get("user")
+
+    # Trim extra sections beyond the standard five per panel (ignore additional fields),
+    # and index the <p>/<h3> of the kept ones so the writes below are plain list lookups
+    index: Dict[str, Dict[str, List[Tag]]] = {}
+    for side, panel in (("left", left), ("right", right)):
+        sections = _sections(panel)
+        for extra in sections[5:]:
+            extra.decompose()
+        index[side] = _index_tags(sections[:5], ("p", "h3"))
 
     # Keep only the first user section
-    user_sections = soup.select(".panel.user .section")
+    user_sections = _sections(user_panel)
     if len(user_sections) > 1:
         for extra in user_sections[1:]:
             extra.decompose()
 
     # Set title & side labels
-    def set_text(selector: str, value: str) -> None:
-        el = soup.select_one(selector)
+    def set_text(el, value: str) -> None:
         if el is not None:
             set_rich_text(el, value)
 
-    set_text("h1", fields["title"])
-    set_text(".panel.left .side-label .tag", fields["left_label"])
-    set_text(".panel.right .side-label .tag", fields["right_label"])
+    set_text(soup.find("h1"), fields["title"])
+    set_text(_side_tag(left), fields["left_label"])
+    set_text(_side_tag(right), fields["right_label"])
 
     # Set panel sections (p elements), preserving line breaks
-    def set_sec(panel_sel: str, idx: int, value: str) -> None:
-        ps = soup.select(f"{panel_sel} .section p")
-        if len(ps) > idx and ps[idx] is not None:
-            set_rich_text(ps[idx], value)
-
-    set_sec(".panel.left", 0, fields["left_people"])
-    set_sec(".panel.left", 1, fields["left_process"])
-    set_sec(".panel.left", 2, fields["left_technology"])
-    set_sec(".panel.left", 3, fields["left_data"])
-    set_sec(".panel.left", 4, fields["left_output"])
-
-    set_sec(".panel.right", 0, fields["right_people"])
-    set_sec(".panel.right", 1, fields["right_process"])
-    set_sec(".panel.right", 2, fields["right_technology"])
-    set_sec(".panel.right", 3, fields["right_data"])
-    set_sec(".panel.right", 4, fields["right_output"])
+    for side in ("left", "right"):
+        for el, key in zip(index[side]["p"], SECTION_KEYS):
+            set_rich_text(el, fields[f"{side}_{key}"])
 
     # User notes (grey panel) — preserved multi-line
-    set_text(".panel.user .section p", fields["user_notes"])
+    user_ps = _section_tags(user_panel, "p")
+    set_text(user_ps[0] if user_ps else None, fields["user_notes"])
 
     # Translate static H3 labels if requested
     if label_lang in STATIC_LABELS:
         labels = STATIC_LABELS[label_lang]
-        left_h3s = soup.select(".panel.left .section h3")
-        right_h3s = soup.select(".panel.right .section h3")
-        desired = [
-            labels["people"],
-            labels["process"],
-            labels["technology"],
-            labels["data"],
-            labels["output"],
-        ]
-        for idx, text in enumerate(desired):
-            if len(left_h3s) > idx and left_h3s[idx]:
-                set_rich_text(left_h3s[idx], text)
-            if len(right_h3s) > idx and right_h3s[idx]:
-                set_rich_text(right_h3s[idx], text)
-
-    # ---- Remove footer so the last visible block is user_notes ----
-    # 1) Remove explicit footer tags/known classes/ids
-    basic_selectors = [
-        "footer",
-        "[role='contentinfo']",
-        ".footer",
-        "#footer",
-        ".page-footer",
-        ".site-footer",
-        ".app-footer",
-    ]
-    for selector in basic_selectors:
-        for el in soup.select(selector):
-            el.decompose()
-
-    # 2) Remove any element whose id or class contains 'footer' (case-insensitive)
-    #    Avoids reliance on CSS attribute contains selectors (works on older bs4 too)
-    for el in list(soup.find_all(True, id=lambda v: isinstance(v, str) and "footer" in v.lower())):
-        el.decompose()
-
-    def _class_contains_footer(v):
-        if not v:
-            return False
-        if isinstance(v, str):
-            return "footer" in v.lower()
-        # v can be list of classes
-        return any(isinstance(x, str) and "footer" in x.lower() for x in v)
-
-    for el in list(soup.find_all(True, class_=_class_contains_footer)):
-        el.decompose()
-
-    # 3) Ensure user panel is positioned as the last visible content block
-    user_panel = soup.select_one(".panel.user")
-    if user_panel and user_panel.parent:
-        parent = user_panel.parent
-        user_panel.extract()
-        parent.append(user_panel)
+        for side in ("left", "right"):
+            for el, key in zip(index[side]["h3"], SECTION_KEYS):
+                set_rich_text(el, labels[key])
 
     return str(soup)
 
+# ---------------- Apply via cached template ----------------
+# Every field slot of the base document holds \x00<key>\x00 in the template; uploads never contain NULs
+_SLOT_RE = re.compile("\x00(\\w+)\x00")
+
+@_session_memo
+def _html_template(base_html: str, label_lang: Optional[str]) -> str:
+    """Serialize the base document once per label language with a placeholder in every field slot."""
+    slots = {k: f"\x00{k}\x00" for k in FIELD_KEYS}
+    return apply_fields_to_soup(_clean_soup(base_html), slots, label_lang)
+
+def _slot_html(value: str) -> str:
+    """What set_rich_text + bs4's "minimal" formatter would emit for value."""
+    return escape(_normalize_newlines(value or ""), quote=False).replace("\n", "<br/>")
+
+def render_fields(base_html: str, fields: Mapping[str, str], label_lang: Optional[str] = None) -> str:
+    """Same output as apply_fields_to_soup on the clean soup, by filling the cached template; no parsing or tree walk per Apply.
+
+    fields may be any mapping holding the field keys (e.g. a session_state snapshot); missing keys use DEFAULTS.
+    """
+    rendered = {k: _slot_html(fields.get(k, DEFAULTS[k])) for k in FIELD_KEYS}
+    # One pass, so a value that happens to contain a slot token is never expanded again
+    return _SLOT_RE.sub(lambda m: rendered.get(m.group(1), m.group(0)), _html_template(base_html, label_lang))
+
 def init_fields(fields: Dict[str, str]) -> None:
     for k in FIELD_KEYS:
-        st.session_state[k] = fields.get(k, DEFAULTS.get(k, ""))
+        st.session_state[k] = fields.get(k, DEFAULTS[k])
     st.session_state["fields_obj"] = {k: st.session_state[k] for k in FIELD_KEYS}
 
 def clear_widget_state() -> None:
-    for k in list(st.session_state.keys()):
-        if k in FIELD_KEYS:
-            st.session_state.pop(k)
+    # The keys to drop are known up front; no need to scan the whole session
+    for k in FIELD_KEYS:
+        st.session_state.pop(k, None)
 
 # =============================== Sidebar ===============================
 with st.sidebar:
@@ -340,13 +547,13 @@ with st.sidebar:
 
     if uploaded is not None:
         file_bytes = uploaded.getvalue()
-        new_hash = hash(file_bytes)
+        new_hash = hashlib.blake2b(file_bytes, digest_size=8).digest()  # stable across processes, unlike hash()
 
         if st.session_state.get("_upload_hash") != new_hash:
             html = file_bytes.decode("utf-8", errors="ignore")
             st.session_state["base_html"] = html
 
-            # Parse values
+            # Parse values (one parse per document, shared with detection; only the bs4 fallback reuses it for Apply)
             parsed = parse_html_fields(html)
             # Detect UI labels (headings) & document language
             ui_detect = detect_ui_labels_from_html(html)
@@ -373,7 +580,7 @@ with st.sidebar:
     lang = st.radio("Translate to", ["sl", "en"], horizontal=True, key="_lang")
     if st.button("🌐 Translate current fields", use_container_width=True):
         src = "sl" if lang == "en" else "en"
-        translated = {k: translate_text(st.session_state.get(k, ""), src, lang) for k in FIELD_KEYS}
+        translated = dict(zip(FIELD_KEYS, translate_many([st.session_state.get(k, "") for k in FIELD_KEYS], src, lang)))
         init_fields(translated)
         st.session_state["_label_lang"] = lang
         st.toast(f"Translated UI labels + fields to {lang.upper()} (best-effort)")
@@ -443,9 +650,11 @@ with st.form("editor_form", clear_on_submit=False):
 
 if submitted:
     st.toast("Applied changes")
-    current = {k: st.session_state.get(k, DEFAULTS.get(k, "")) for k in FIELD_KEYS}
-    label_lang = st.session_state.get("_label_lang", "sl")
-    preview_html = apply_fields_to_html(base_html, current, label_lang=label_lang)
+    # One snapshot instead of 13 round-trips through the SessionStateProxy; read by render_fields as-is
+    ss = st.session_state.to_dict()
+    label_lang = ss.get("_label_lang", "sl")
+    # The bs4 tree is only built (once per document and label language) to make the template
+    preview_html = render_fields(base_html, ss, label_lang=label_lang)
 
     st.subheader("Preview")
     st.components.v1.html(preview_html, height=900, scrolling=True)